@@ -1,3 +1,4 @@
+import click
 from flask import Flask
 from flask_pymongo import PyMongo
 from config import Config
@@ -21,4 +22,13 @@ def create_app(config_class = Config):
     with app.app_context():
         mongo.db.courses.create_index('name', unique=True)
 
+        from app.models.stats import CourseStats
+        CourseStats.seed()
+
+    @app.cli.command('rebuild-stats')
+    def rebuild_stats():
+        from app.models.stats import CourseStats
+        CourseStats.rebuild()
+        click.echo('Course stats rebuilt')
+
     return app
\ No newline at end of file
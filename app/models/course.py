@@ -8,12 +8,16 @@ class Course:
 
         if not course_data.get('name'):
             errors['name'] = 'Name is required'
-        elif len(course_data.get('name', '')) < 3:
+        elif not isinstance(course_data['name'], str):
+            errors['name'] = 'Name must be a string'
+        elif len(course_data['name']) < 3:
             errors['name'] = 'Name must be at least 3 characters'
 
 
         if not course_data.get('syllabus'):
             errors['syllabus'] = 'Syllabus is required'
+        elif not isinstance(course_data['syllabus'], str):
+            errors['syllabus'] = 'Syllabus must be a string'
     
         return errors
     @staticmethod
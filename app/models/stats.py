@@ -0,0 +1,249 @@
+import string
+from pymongo import UpdateOne
+from pymongo.errors import DuplicateKeyError
+from app import mongo
+
+
+SYLLABUS_BUCKETS = [
+    (0, 100, '0-99'),
+    (100, 500, '100-499'),
+    (500, 1000, '500-999'),
+    (1000, None, '1000+')
+]
+
+# $toLower is only defined for ASCII, so python lowercases the same way
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+class CourseStats:
+    # counters live in a single document so reads are one lookup.
+    # min/max syllabus length are kept with $min/$max on insert and only
+    # recomputed after a write removes or shrinks a current extreme.
+    # counter updates run after the course write and are not atomic with it,
+    # if they drift the `flask rebuild-stats` command recounts them
+
+    # same rules as syllabus_length / name_prefix, for use inside pipelines
+    _LENGTH_EXPR = {'$cond': [
+        {'$eq': [{'$type': '$syllabus'}, 'string']},
+        {'$strLenCP': '$syllabus'},
+        0
+    ]}
+    _PREFIX_EXPR = {'$cond': [
+        {'$eq': [{'$type': '$name'}, 'string']},
+        {'$toLower': {'$arrayElemAt': [{'$split': [{'$trim': {'input': '$name', 'chars': ' '}}, ' ']}, 0]}},
+        ''
+    ]}
+
+    @staticmethod
+    def syllabus_length(syllabus):
+        return len(syllabus) if isinstance(syllabus, str) else 0
+
+    @staticmethod
+    def syllabus_bucket(syllabus):
+        size = CourseStats.syllabus_length(syllabus)
+        for low, high, label in SYLLABUS_BUCKETS:
+            if size >= low and (high is None or size < high):
+                return label
+
+    @staticmethod
+    def name_prefix(name):
+        if not isinstance(name, str):
+            return ''
+        return name.strip(' ').split(' ')[0].translate(_ASCII_LOWER)
+
+    @staticmethod
+    def _inc_prefix(prefix, step):
+        if not prefix:
+            return
+        mongo.db.course_prefixes.update_one({'_id': prefix}, {'$inc': {'count': step}}, upsert=True)
+        if step < 0:
+            mongo.db.course_prefixes.delete_one({'_id': prefix, 'count': {'$lte': 0}})
+
+    @staticmethod
+    def _mark_extremes_stale(extremes):
+        # extremes: filter on the stored min/max that a write may have invalidated
+        mongo.db.stats.update_one(
+            {'_id': 'courses', '$or': extremes},
+            {'$set': {'extremes_stale': True}}
+        )
+
+    @staticmethod
+    def course_added(course):
+        length = CourseStats.syllabus_length(course.get('syllabus'))
+        bucket = CourseStats.syllabus_bucket(course.get('syllabus'))
+        mongo.db.stats.update_one(
+            {'_id': 'courses'},
+            {
+                '$inc': {'total': 1, f'syllabus_sizes.{bucket}': 1, 'syllabus_length_sum': length, 'version': 1},
+                '$min': {'syllabus_length_min': length},
+                '$max': {'syllabus_length_max': length}
+            },
+            upsert=True
+        )
+        CourseStats._inc_prefix(CourseStats.name_prefix(course.get('name')), 1)
+
+    @staticmethod
+    def course_removed(course):
+        length = CourseStats.syllabus_length(course.get('syllabus'))
+        bucket = CourseStats.syllabus_bucket(course.get('syllabus'))
+        CourseStats._mark_extremes_stale([{'syllabus_length_min': length}, {'syllabus_length_max': length}])
+        mongo.db.stats.update_one(
+            {'_id': 'courses'},
+            {'$inc': {'total': -1, f'syllabus_sizes.{bucket}': -1, 'syllabus_length_sum': -length, 'version': 1}},
+            upsert=True
+        )
+        CourseStats._inc_prefix(CourseStats.name_prefix(course.get('name')), -1)
+
+    @staticmethod
+    def course_updated(old_course, new_course):
+        old_bucket = CourseStats.syllabus_bucket(old_course.get('syllabus'))
+        new_bucket = CourseStats.syllabus_bucket(new_course.get('syllabus'))
+        old_prefix = CourseStats.name_prefix(old_course.get('name'))
+        new_prefix = CourseStats.name_prefix(new_course.get('name'))
+        old_length = CourseStats.syllabus_length(old_course.get('syllabus'))
+        new_length = CourseStats.syllabus_length(new_course.get('syllabus'))
+
+        if old_bucket == new_bucket and old_prefix == new_prefix and old_length == new_length:
+            return
+
+        update = {'$inc': {'version': 1}}
+        if old_bucket != new_bucket:
+            update['$inc'][f'syllabus_sizes.{old_bucket}'] = -1
+            update['$inc'][f'syllabus_sizes.{new_bucket}'] = 1
+        if old_length != new_length:
+            if new_length < old_length:
+                CourseStats._mark_extremes_stale([{'syllabus_length_max': old_length}])
+            else:
+                CourseStats._mark_extremes_stale([{'syllabus_length_min': old_length}])
+            update['$inc']['syllabus_length_sum'] = new_length - old_length
+            update['$min'] = {'syllabus_length_min': new_length}
+            update['$max'] = {'syllabus_length_max': new_length}
+        mongo.db.stats.update_one({'_id': 'courses'}, update, upsert=True)
+
+        if old_prefix != new_prefix:
+            CourseStats._inc_prefix(old_prefix, -1)
+            CourseStats._inc_prefix(new_prefix, 1)
+
+    @staticmethod
+    def _count_all():
+        branches = [
+            {'case': {'$lt': ['$length', high]}, 'then': label}
+            for _, high, label in SYLLABUS_BUCKETS if high is not None
+        ]
+        pipeline = [
+            {'$project': {'length': CourseStats._LENGTH_EXPR, 'prefix': CourseStats._PREFIX_EXPR}},
+            {'$facet': {
+                'lengths': [{'$group': {
+                    '_id': None,
+                    'total': {'$sum': 1},
+                    'sum': {'$sum': '$length'},
+                    'min': {'$min': '$length'},
+                    'max': {'$max': '$length'}
+                }}],
+                'syllabus_sizes': [{'$group': {
+                    '_id': {'$switch': {'branches': branches, 'default': SYLLABUS_BUCKETS[-1][2]}},
+                    'count': {'$sum': 1}
+                }}],
+                'name_prefixes': [
+                    {'$match': {'prefix': {'$ne': ''}}},
+                    {'$group': {'_id': '$prefix', 'count': {'$sum': 1}}}
+                ]
+            }}
+        ]
+        figures = list(mongo.db.courses.aggregate(pipeline))[0]
+
+        sizes = {label: 0 for _, _, label in SYLLABUS_BUCKETS}
+        sizes.update({bucket['_id']: bucket['count'] for bucket in figures['syllabus_sizes']})
+        counters = {'total': 0, 'syllabus_sizes': sizes, 'syllabus_length_sum': 0, 'extremes_stale': False}
+        if figures['lengths']:
+            lengths = figures['lengths'][0]
+            counters.update({
+                'total': lengths['total'],
+                'syllabus_length_sum': lengths['sum'],
+                'syllabus_length_min': lengths['min'],
+                'syllabus_length_max': lengths['max']
+            })
+        prefixes = {prefix['_id']: prefix['count'] for prefix in figures['name_prefixes']}
+        return counters, prefixes
+
+    @staticmethod
+    def _write_prefixes(prefixes):
+        mongo.db.course_prefixes.delete_many({'_id': {'$nin': list(prefixes)}})
+        if prefixes:
+            mongo.db.course_prefixes.bulk_write([
+                UpdateOne({'_id': prefix}, {'$set': {'count': count}}, upsert=True)
+                for prefix, count in prefixes.items()
+            ])
+
+    @staticmethod
+    def seed():
+        # only runs when the counters document is missing (fresh database)
+        if mongo.db.stats.find_one({'_id': 'courses'}, {'_id': 1}):
+            return
+
+        counters, prefixes = CourseStats._count_all()
+        try:
+            result = mongo.db.stats.update_one(
+                {'_id': 'courses'},
+                {'$setOnInsert': dict(counters, version=0)},
+                upsert=True
+            )
+        except DuplicateKeyError:
+            # another worker seeded first
+            return
+        if result.upserted_id is not None:
+            CourseStats._write_prefixes(prefixes)
+
+    @staticmethod
+    def rebuild():
+        # maintenance: recount everything, overwriting drifted counters
+        counters, prefixes = CourseStats._count_all()
+        update = {'$set': counters, '$inc': {'version': 1}}
+        if not counters['total']:
+            update['$unset'] = {'syllabus_length_min': '', 'syllabus_length_max': ''}
+        mongo.db.stats.update_one({'_id': 'courses'}, update, upsert=True)
+        CourseStats._write_prefixes(prefixes)
+
+    @staticmethod
+    def _refresh_extremes(version):
+        pipeline = [
+            {'$project': {'length': CourseStats._LENGTH_EXPR}},
+            {'$group': {'_id': None, 'min': {'$min': '$length'}, 'max': {'$max': '$length'}}}
+        ]
+        result = list(mongo.db.courses.aggregate(pipeline))
+        if result:
+            extremes = {'syllabus_length_min': result[0]['min'], 'syllabus_length_max': result[0]['max']}
+            update = {'$set': dict(extremes, extremes_stale=False)}
+        else:
+            extremes = {}
+            update = {
+                '$set': {'extremes_stale': False},
+                '$unset': {'syllabus_length_min': '', 'syllabus_length_max': ''}
+            }
+        # only store it if no write landed while the pipeline ran
+        mongo.db.stats.update_one({'_id': 'courses', 'version': version}, update)
+        return extremes
+
+    @staticmethod
+    def get():
+        counters = mongo.db.stats.find_one({'_id': 'courses'}) or {}
+        if counters.get('extremes_stale'):
+            for key in ('syllabus_length_min', 'syllabus_length_max'):
+                counters.pop(key, None)
+            counters.update(CourseStats._refresh_extremes(counters.get('version', 0)))
+
+        total = counters.get('total', 0)
+        prefixes = {
+            prefix['_id']: prefix['count']
+            for prefix in mongo.db.course_prefixes.find({'count': {'$gt': 0}})
+        }
+        return {
+            'total': total,
+            'syllabus_sizes': counters.get('syllabus_sizes', {}),
+            'syllabus_length': {
+                'min': counters.get('syllabus_length_min', 0),
+                'max': counters.get('syllabus_length_max', 0),
+                'avg': round(counters.get('syllabus_length_sum', 0) / total, 2) if total else 0
+            },
+            'name_prefixes': prefixes
+        }
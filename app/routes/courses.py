@@ -1,11 +1,22 @@
 from flask import Blueprint, request, jsonify
 from bson import ObjectId
+from pymongo import ReturnDocument
 from app import mongo
 from app.models.course import Course
+from app.models.stats import CourseStats
 import random
+import traceback
 
 courses_bp = Blueprint('courses', __name__, url_prefix='/api/courses')
 
+def record_stats(hook, *courses):
+    # the course write already went through, a failed counter update only
+    # leaves drift for `flask rebuild-stats` to fix so the request still succeeds
+    try:
+        hook(*courses)
+    except Exception:
+        traceback.print_exc()
+
 @courses_bp.route('/', methods=['GET'], strict_slashes = False)
 def get_courses():  
     courses = list(mongo.db.courses.find())
@@ -14,6 +25,11 @@ def get_courses():
         course['_id'] = str(course['_id'])
     return jsonify(courses)
 
+@courses_bp.route('/stats', methods=['GET'])
+def get_courses_stats():
+    stats = CourseStats.get()
+    return jsonify(stats)
+
 @courses_bp.route('/<course_id>', methods=['GET'])
 def get_course(course_id):
     try:
@@ -51,6 +67,7 @@ def create_course():
 
         
     result = mongo.db.courses.insert_one(course_data)
+    record_stats(CourseStats.course_added, course_data)
     new_course = mongo.db.courses.find_one({'_id': new_id})
     new_course = Course.format_course(new_course)
 
@@ -80,16 +97,19 @@ def update_course(course_id):
         if name_conflict:
             return jsonify({'error': 'Another course with this name already exists'}), 409
         
-        mongo.db.courses.update_one(
+        previous = mongo.db.courses.find_one_and_update(
             { '_id':  course_id},
-            {'$set': course_data}
+            {'$set': course_data},
+            return_document=ReturnDocument.BEFORE
         )
+        if not previous:
+            return jsonify({'error': 'Course not found'}), 404
+        record_stats(CourseStats.course_updated, previous, {**previous, **course_data})
         updated_course = mongo.db.courses.find_one({'_id':  course_id})
         updated_course = Course.format_course(updated_course) 
         
         return jsonify(updated_course)
     except Exception as e:
-        import traceback
         traceback.print_exc()
         return jsonify({'error': 'Invalid course ID'}), 400
 
@@ -103,8 +123,11 @@ def delete_course(course_id):
         if not course:
             return jsonify({'error': 'Course not found'}), 404
         
-        # Then delete it
-        mongo.db.courses.delete_one({'_id':  course_id})
+        # Then delete it, only counting it if this request removed it
+        result = mongo.db.courses.delete_one({'_id':  course_id})
+        if result.deleted_count != 1:
+            return jsonify({'error': 'Course not found'}), 404
+        record_stats(CourseStats.course_removed, course)
         
         # Format and return the deleted course info
         course = Course.format_course(course)
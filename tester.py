@@ -144,18 +144,20 @@ class APITester:
             except:
                 self.log("Failed to parse created course JSON", "WARNING")
         
-        # Test 3: Get all courses (after creation)
-        result, response = self.test_endpoint('GET', '', expected_status=200, description="Get all courses (after create)")
+        # Test 3: Get course stats (after creation)
+        result, response = self.test_endpoint('GET', '/stats', expected_status=200, description="Get course stats (after create)")
         iteration_results['tests'].append(result)
         
+        after_stats = None
         if response and response.status_code == 200:
             try:
-                after_courses = response.json()
-                self.log(f"Courses count after creation: {len(after_courses)}")
-                if len(after_courses) != len(initial_courses) + 1:
-                    self.log(f"WARNING: Expected {len(initial_courses) + 1} courses, found {len(after_courses)}", "WARNING")
+                after_stats = response.json()
+                after_total = after_stats['total']
+                self.log(f"Courses count after creation: {after_total}")
+                if after_total != len(initial_courses) + 1:
+                    self.log(f"WARNING: Expected {len(initial_courses) + 1} courses, found {after_total}", "WARNING")
             except:
-                self.log("Failed to parse courses JSON after creation", "WARNING")
+                self.log("Failed to parse course stats JSON after creation", "WARNING")
         
         # Test 4: Get single course (if we have an ID)
         if iteration_results['created_course_id']:
@@ -164,30 +166,56 @@ class APITester:
         
         # Test 5: Update course (if we have an ID)
         if iteration_results['created_course_id']:
+            # New name prefix ('test' -> 'updated') and syllabus bucket ('0-99' -> '100-499')
             update_data = {
                 "name": f"Updated Course {self.iteration_count}",
-                "syllabus": f"Updated syllabus for iteration {self.iteration_count}"
+                "syllabus": f"Updated syllabus for iteration {self.iteration_count} " + "x" * 100
             }
             result, response = self.test_endpoint('PUT', f"/{iteration_results['created_course_id']}", data=update_data, expected_status=200, description="Update course")
             iteration_results['tests'].append(result)
+            
+            # Test 5b: Get course stats (after update) - counters should follow the update
+            result, response = self.test_endpoint('GET', '/stats', expected_status=200, description="Get course stats (after update)")
+            iteration_results['tests'].append(result)
+            
+            if response and response.status_code == 200 and after_stats:
+                try:
+                    stats = response.json()
+                    checks = [
+                        ("total", stats['total'], after_stats['total']),
+                        ("'test' prefix", stats['name_prefixes'].get('test', 0), after_stats['name_prefixes'].get('test', 0) - 1),
+                        ("'updated' prefix", stats['name_prefixes'].get('updated', 0), after_stats['name_prefixes'].get('updated', 0) + 1),
+                        ("'0-99' syllabi", stats['syllabus_sizes'].get('0-99', 0), after_stats['syllabus_sizes'].get('0-99', 0) - 1),
+                        ("'100-499' syllabi", stats['syllabus_sizes'].get('100-499', 0), after_stats['syllabus_sizes'].get('100-499', 0) + 1)
+                    ]
+                    for label, found, expected in checks:
+                        if found != expected:
+                            result['success'] = False
+                            self.log(f"WARNING: Expected {expected} for {label} after update, found {found}", "WARNING")
+                    if stats['syllabus_length']['max'] < len(update_data['syllabus']):
+                        result['success'] = False
+                        self.log(f"WARNING: Expected syllabus max length >= {len(update_data['syllabus'])}, found {stats['syllabus_length']['max']}", "WARNING")
+                except:
+                    result['success'] = False
+                    self.log("Failed to parse course stats JSON after update", "WARNING")
         
         # Test 6: Delete course (if we have an ID)
         if iteration_results['created_course_id']:
             result, response = self.test_endpoint('DELETE', f"/{iteration_results['created_course_id']}", expected_status=200, description="Delete course")
             iteration_results['tests'].append(result)
         
-        # Test 7: Get all courses (after deletion)
-        result, response = self.test_endpoint('GET', '', expected_status=200, description="Get all courses (after delete)")
+        # Test 7: Get course stats (after deletion)
+        result, response = self.test_endpoint('GET', '/stats', expected_status=200, description="Get course stats (after delete)")
         iteration_results['tests'].append(result)
         
         if response and response.status_code == 200:
             try:
-                final_courses = response.json()
-                self.log(f"Final courses count: {len(final_courses)}")
-                if len(final_courses) != len(initial_courses):
-                    self.log(f"WARNING: Expected {len(initial_courses)} courses at end, found {len(final_courses)}", "WARNING")
+                final_total = response.json()['total']
+                self.log(f"Final courses count: {final_total}")
+                if final_total != len(initial_courses):
+                    self.log(f"WARNING: Expected {len(initial_courses)} courses at end, found {final_total}", "WARNING")
             except:
-                self.log("Failed to parse final courses JSON", "WARNING")
+                self.log("Failed to parse final course stats JSON", "WARNING")
         
         # Test 8: Test invalid ID error handling
         result, response = self.test_endpoint('GET', '/invalid_id', expected_status=400, description="Test invalid ID handling")
@@ -198,6 +226,15 @@ class APITester:
         result, response = self.test_endpoint('POST', '', data=invalid_data, expected_status=400, description="Test validation errors")
         iteration_results['tests'].append(result)
         
+        # Test 9b: Non-string syllabus is rejected and stats keep working
+        for syllabus in (["x"], {"a": 1}):
+            non_string_data = {"name": f"Non String Syllabus {self.iteration_count}", "syllabus": syllabus}
+            result, response = self.test_endpoint('POST', '', data=non_string_data, expected_status=400, description=f"Test non-string syllabus ({type(syllabus).__name__})")
+            iteration_results['tests'].append(result)
+        
+        result, response = self.test_endpoint('GET', '/stats', expected_status=200, description="Get course stats (after non-string syllabus)")
+        iteration_results['tests'].append(result)
+        
         # Test 10: Test duplicate name handling
         if len(initial_courses) > 0:
             # Try to create a course with the same name as an existing one